@@ -106,8 +106,9 @@ content:
   sample: "when LB_FAILED { set wipHost [LB::server addr] }"
 '''
 
-import os
+import errno
 
+from ansible.module_utils._text import to_text
 from ansible.module_utils.f5_utils import AnsibleF5Client
 from ansible.module_utils.f5_utils import AnsibleF5Parameters
 from ansible.module_utils.f5_utils import HAS_F5SDK
@@ -136,34 +137,54 @@ class Parameters(AnsibleF5Parameters):
         'content', 'src', 'module'
     ]
 
+    # Pairs of (API attribute, parameter attribute) for api_params. Both
+    # lists above are constant, so they are resolved here once. map() is
+    # used because a comprehension in a class body cannot see api_map.
+    _api_plan = tuple(
+        zip(api_attributes, map(api_map.get, api_attributes, api_attributes))
+    )
+
+    def __init__(self, params=None):
+        self._content_cached = None
+        self._src_content_cached = None
+        super(Parameters, self).__init__(params=params)
+
+    def update(self, params=None):
+        # Any new values may change 'content' or point 'src' at a different
+        # file, so drop what has been computed so far.
+        self._content_cached = None
+        self._src_content_cached = None
+        super(Parameters, self).update(params=params)
+
     def to_return(self):
         result = {}
-        try:
-            for returnable in self.returnables:
-                result[returnable] = getattr(self, returnable)
-            result = self._filter_params(result)
-        except Exception:
-            pass
+        for returnable in self.returnables:
+            value = getattr(self, returnable)
+            if value is not None:
+                result[returnable] = value
         return result
 
     def api_params(self):
         result = {}
-        for api_attribute in self.api_attributes:
-            if self.api_map is not None and api_attribute in self.api_map:
-                result[api_attribute] = getattr(self, self.api_map[api_attribute])
-            else:
-                result[api_attribute] = getattr(self, api_attribute)
-        result = self._filter_params(result)
+        for api_attribute, attribute in self._api_plan:
+            value = getattr(self, attribute)
+            if value is not None:
+                result[api_attribute] = value
         return result
 
     @property
     def content(self):
-        if self._values['content'] is None:
+        if self._content_cached is not None:
+            return self._content_cached
+        if self._values['content'] is not None:
+            result = self._values['content']
+        elif self._values['src'] is not None:
             result = self.src_content
         else:
-            result = self._values['content']
+            return None
 
-        return str(result).strip()
+        self._content_cached = to_text(result).strip()
+        return self._content_cached
 
     @property
     def src(self):
@@ -173,13 +194,20 @@ class Parameters(AnsibleF5Parameters):
 
     @property
     def src_content(self):
-        if not os.path.exists(self._values['src']):
+        # The content is requested several times during a single run, so
+        # the file is only read from disk the first time.
+        if self._src_content_cached is not None:
+            return self._src_content_cached
+        try:
+            with open(self._values['src'], 'rb') as f:
+                self._src_content_cached = to_text(f.read(), errors='surrogate_or_replace')
+        except IOError as ex:
+            if ex.errno != errno.ENOENT:
+                raise
             raise F5ModuleError(
                 "The specified 'src' was not found."
             )
-        with open(self._values['src']) as f:
-            result = f.read()
-        return result
+        return self._src_content_cached
 
 
 class ModuleManager(object):
@@ -205,10 +233,15 @@ class ModuleManager(object):
 
 
 class BaseManager(object):
+    # The BIG-IP module (ltm or gtm) whose iRules are managed. Set by
+    # the subclasses.
+    module_name = None
+
     def __init__(self, client):
         self.client = client
         self.want = Parameters(self.client.module.params)
         self.changes = Parameters()
+        self._rules = None
 
     def exec_module(self):
         changed = False
@@ -231,8 +264,9 @@ class BaseManager(object):
     def _set_changed_options(self):
         changed = {}
         for key in Parameters.returnables:
-            if getattr(self.want, key) is not None:
-                changed[key] = getattr(self.want, key)
+            value = getattr(self.want, key)
+            if value is not None:
+                changed[key] = value
         if changed:
             self.changes = Parameters(changed)
 
@@ -254,18 +288,28 @@ class BaseManager(object):
             raise F5ModuleError(
                 "Either 'content' or 'src' must be provided"
             )
-        if self.exists():
-            return self.update()
-        else:
+        if self.client.check_mode:
+            if self.exists():
+                return self.update()
+            else:
+                return self.create()
+
+        # Rather than asking the device whether the iRule exists first, try
+        # to create it and fall back to updating it when the device reports
+        # that it is already there.
+        try:
             return self.create()
+        except iControlUnexpectedHTTPError as ex:
+            if ex.response is None or ex.response.status_code != 409:
+                raise
+        self.changes = Parameters()
+        return self.update()
 
     def create(self):
         self._set_changed_options()
         if self.client.check_mode:
             return True
         self.create_on_device()
-        if not self.exists():
-            raise F5ModuleError("Failed to create the iRule")
         return True
 
     def should_update(self):
@@ -284,22 +328,44 @@ class BaseManager(object):
         return True
 
     def absent(self):
-        if self.exists():
+        if self.client.check_mode:
+            if self.exists():
+                return self.remove()
+            return False
+
+        # A 404 from the DELETE means there was nothing to remove.
+        try:
             return self.remove()
+        except iControlUnexpectedHTTPError as ex:
+            if ex.response is None or ex.response.status_code != 404:
+                raise
         return False
 
     def remove(self):
         if self.client.check_mode:
             return True
         self.remove_from_device()
-        if self.exists():
-            raise F5ModuleError("Failed to delete the iRule")
         return True
 
+    @property
+    def rules(self):
+        if self._rules is None:
+            module = getattr(self.client.api.tm, self.module_name)
+            self._rules = module.rules
+        return self._rules
+
+    def resource_uri(self):
+        # Addressing the rule directly lets us PATCH or DELETE it in a
+        # single request instead of loading it through the SDK first.
+        return '{0}tm/{1}/rule/~{2}~{3}'.format(
+            self.client.api._meta_data['uri'],
+            self.module_name,
+            self.want.partition,
+            self.want.name
+        )
 
-class LtmManager(BaseManager):
     def exists(self):
-        result = self.client.api.tm.ltm.rules.rule.exists(
+        result = self.rules.rule.exists(
             name=self.want.name,
             partition=self.want.partition
         )
@@ -307,15 +373,11 @@ class LtmManager(BaseManager):
 
     def update_on_device(self):
         params = self.changes.api_params()
-        resource = self.client.api.tm.ltm.rules.rule.load(
-            name=self.want.name,
-            partition=self.want.partition
-        )
-        resource.update(**params)
+        self.client.api.icrs.patch(self.resource_uri(), json=params)
 
     def create_on_device(self):
         params = self.want.api_params()
-        resource = self.client.api.tm.ltm.rules.rule
+        resource = self.rules.rule
         resource.create(
             name=self.want.name,
             partition=self.want.partition,
@@ -323,60 +385,25 @@ class LtmManager(BaseManager):
         )
 
     def read_current_from_device(self):
-        resource = self.client.api.tm.ltm.rules.rule.load(
-            name=self.want.name,
-            partition=self.want.partition
+        # Only the rule body is compared against what we want, so the
+        # rest of the resource is not requested.
+        response = self.client.api.icrs.get(
+            self.resource_uri(),
+            params={'$select': ','.join(Parameters.api_attributes)}
         )
-        result = resource.attrs
+        result = response.json()
         return Parameters(result)
 
     def remove_from_device(self):
-        resource = self.client.api.tm.ltm.rules.rule.load(
-            name=self.want.name,
-            partition=self.want.partition
-        )
-        resource.delete()
-
-
-class GtmManager(BaseManager):
-    def read_current_from_device(self):
-        resource = self.client.api.tm.gtm.rules.rule.load(
-            name=self.want.name,
-            partition=self.want.partition
-        )
-        result = resource.attrs
-        return Parameters(result)
+        self.client.api.icrs.delete(self.resource_uri())
 
-    def remove_from_device(self):
-        resource = self.client.api.tm.gtm.rules.rule.load(
-            name=self.want.name,
-            partition=self.want.partition
-        )
-        resource.delete()
 
-    def exists(self):
-        result = self.client.api.tm.gtm.rules.rule.exists(
-            name=self.want.name,
-            partition=self.want.partition
-        )
-        return result
+class LtmManager(BaseManager):
+    module_name = 'ltm'
 
-    def update_on_device(self):
-        params = self.changes.api_params()
-        resource = self.client.api.tm.gtm.rules.rule.load(
-            name=self.want.name,
-            partition=self.want.partition
-        )
-        resource.update(**params)
 
-    def create_on_device(self):
-        params = self.want.api_params()
-        resource = self.client.api.tm.gtm.rules.rule
-        resource.create(
-            name=self.want.name,
-            partition=self.want.partition,
-            **params
-        )
+class GtmManager(BaseManager):
+    module_name = 'gtm'
 
 
 class ArgumentSpec(object):
@@ -405,10 +432,12 @@ class ArgumentSpec(object):
 
 def cleanup_tokens(client):
     try:
-        resource = client.api.shared.authz.tokens_s.token.load(
-            name=client.api.icrs.token
+        # The token can be deleted by name without loading it first.
+        uri = '{0}shared/authz/tokens/{1}'.format(
+            client.api._meta_data['uri'],
+            client.api.icrs.token
         )
-        resource.delete()
+        client.api.icrs.delete(uri)
     except Exception:
         pass
 
@@ -19,6 +19,7 @@ from ansible.compat.tests.mock import Mock
 from ansible.compat.tests.mock import patch
 from ansible.compat.tests.mock import mock_open
 from ansible.module_utils.f5_utils import AnsibleF5Client
+from ansible.module_utils.f5_utils import F5ModuleError
 from ansible.module_utils.six import PY3
 
 try:
@@ -112,6 +113,49 @@ class TestParameters(unittest.TestCase):
 
         assert 'apiAnonymous' in params
 
+    def test_src_content_read_once(self):
+        args = dict(
+            src='{0}/create_ltm_irule.tcl'.format(fixture_path),
+            module='ltm',
+            name='foo',
+            state='present'
+        )
+
+        if PY3:
+            builtins_name = 'builtins'
+        else:
+            builtins_name = '__builtin__'
+
+        m = mock_open(read_data='this is my content')
+        with patch(builtins_name + '.open', m, create=True):
+            p = Parameters(args)
+            assert p.content == 'this is my content'
+            assert p.content == 'this is my content'
+            assert p.api_params()['apiAnonymous'] == 'this is my content'
+        assert m.call_count == 1
+
+    def test_src_content_missing_file(self):
+        args = dict(
+            src='{0}/does_not_exist.tcl'.format(fixture_path),
+            module='ltm',
+            name='foo',
+            state='present'
+        )
+        p = Parameters(args)
+        with self.assertRaises(F5ModuleError):
+            p.content
+
+    def test_empty_parameters_return_nothing(self):
+        p = Parameters()
+        assert p.content is None
+        assert p.to_return() == {}
+
+    def test_content_cache_reset_on_update(self):
+        p = Parameters(dict(content=' foo '))
+        assert p.content == 'foo'
+        p.update(dict(content=' bar '))
+        assert p.content == 'bar'
+
 
 @patch('ansible.module_utils.f5_utils.AnsibleF5Client._get_mgmt_root',
        return_value=True)
@@ -235,6 +279,172 @@ class TestManager(unittest.TestCase):
         assert results['src'] == '{0}/create_ltm_irule.tcl'.format(fixture_path)
         assert len(results.keys()) == 4
 
+    def test_update_and_remove_ltm_irule_single_request(self, *args):
+        set_module_args(dict(
+            name='foo',
+            module='ltm',
+            content='this is my content',
+            partition='Common',
+            server='localhost',
+            password='password',
+            user='admin'
+        ))
+
+        client = AnsibleF5Client(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode,
+            f5_product_name=self.spec.f5_product_name,
+            mutually_exclusive=self.spec.mutually_exclusive,
+        )
+        client.api = Mock()
+        client.api._meta_data = dict(uri='https://localhost:443/mgmt/')
+
+        tm = LtmManager(client)
+        tm.changes = Parameters(dict(content='this is my content'))
+        tm.update_on_device()
+        tm.remove_from_device()
+
+        uri = 'https://localhost:443/mgmt/tm/ltm/rule/~Common~foo'
+        client.api.icrs.patch.assert_called_once_with(
+            uri, json=dict(apiAnonymous='this is my content')
+        )
+        client.api.icrs.delete.assert_called_once_with(uri)
+        assert client.api.tm.ltm.rules.rule.load.called is False
+
+    def test_read_ltm_irule_selects_body_only(self, *args):
+        set_module_args(dict(
+            name='foo',
+            module='ltm',
+            content='this is my content',
+            partition='Common',
+            server='localhost',
+            password='password',
+            user='admin'
+        ))
+
+        client = AnsibleF5Client(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode,
+            f5_product_name=self.spec.f5_product_name,
+            mutually_exclusive=self.spec.mutually_exclusive,
+        )
+        client.api = Mock()
+        client.api._meta_data = dict(uri='https://localhost:443/mgmt/')
+        client.api.icrs.get.return_value.json.return_value = dict(
+            apiAnonymous='this is my content\n'
+        )
+
+        tm = LtmManager(client)
+        have = tm.read_current_from_device()
+
+        client.api.icrs.get.assert_called_once_with(
+            'https://localhost:443/mgmt/tm/ltm/rule/~Common~foo',
+            params={'$select': 'apiAnonymous'}
+        )
+        assert have.content == 'this is my content'
+
+    def test_gtm_irule_resource_uri(self, *args):
+        set_module_args(dict(
+            name='foo',
+            module='gtm',
+            content='this is my content',
+            partition='Common',
+            server='localhost',
+            password='password',
+            user='admin'
+        ))
+
+        client = AnsibleF5Client(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode,
+            f5_product_name=self.spec.f5_product_name,
+            mutually_exclusive=self.spec.mutually_exclusive,
+        )
+        client.api = Mock()
+        client.api._meta_data = dict(uri='https://localhost:443/mgmt/')
+
+        tm = GtmManager(client)
+
+        assert tm.resource_uri() == 'https://localhost:443/mgmt/tm/gtm/rule/~Common~foo'
+        assert tm.rules is client.api.tm.gtm.rules
+
+    def test_update_ltm_irule_when_create_conflicts(self, *args):
+        set_module_args(dict(
+            name='foo',
+            module='ltm',
+            content='this is my new content',
+            partition='Common',
+            server='localhost',
+            password='password',
+            user='admin'
+        ))
+
+        client = AnsibleF5Client(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode,
+            f5_product_name=self.spec.f5_product_name,
+            mutually_exclusive=self.spec.mutually_exclusive,
+        )
+
+        conflict = iControlUnexpectedHTTPError(
+            '409 Conflict', response=Mock(status_code=409)
+        )
+        current = Parameters(dict(apiAnonymous='this is my content'))
+
+        # Override methods in the specific type of manager
+        tm = LtmManager(client)
+        tm.exists = Mock()
+        tm.create_on_device = Mock(side_effect=conflict)
+        tm.read_current_from_device = Mock(return_value=current)
+        tm.update_on_device = Mock(return_value=True)
+
+        # Override methods to force specific logic in the module to happen
+        mm = ModuleManager(client)
+        mm.get_manager = Mock(return_value=tm)
+
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert results['content'] == 'this is my new content'
+        assert tm.exists.called is False
+        assert tm.update_on_device.call_count == 1
+
+    def test_remove_missing_ltm_irule(self, *args):
+        set_module_args(dict(
+            name='foo',
+            module='ltm',
+            state='absent',
+            partition='Common',
+            server='localhost',
+            password='password',
+            user='admin'
+        ))
+
+        client = AnsibleF5Client(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode,
+            f5_product_name=self.spec.f5_product_name,
+            mutually_exclusive=self.spec.mutually_exclusive,
+        )
+
+        not_found = iControlUnexpectedHTTPError(
+            '404 Not Found', response=Mock(status_code=404)
+        )
+
+        # Override methods in the specific type of manager
+        tm = LtmManager(client)
+        tm.exists = Mock()
+        tm.remove_from_device = Mock(side_effect=not_found)
+
+        # Override methods to force specific logic in the module to happen
+        mm = ModuleManager(client)
+        mm.get_manager = Mock(return_value=tm)
+
+        results = mm.exec_module()
+
+        assert results['changed'] is False
+        assert tm.exists.called is False
+
     def test_module_mutual_exclusion(self, *args):
         set_module_args(dict(
             content='foo',